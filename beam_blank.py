@@ -1,24 +1,23 @@
 import tkinter as tk
 from PyJEM import TEM3
-import threading
 import keyboard
  
 class BeamControllerApp:
+    # (SetBeamBlank value, button text, button colour), indexed by is_blank
+    _STATES = [(0, "Blank Beam", '#32CD32'), (1, "Unblank Beam", '#65A8E1')]
+ 
     def __init__(self, master):
         self.master = master
         master.title("Beam Blank Controller")
  
         self.tem = TEM3
-        self.is_blank = self.tem.Def3().GetBeamBlank()
+        self.def3 = self.tem.Def3()
+        self.is_blank = bool(self.def3.GetBeamBlank())
         self.current_hotkey = 'alt+q'
  
-        self.btn = tk.Button(master, text="Blank Beam", width=20, command=self.toggle_beam)
+        _, text, bg = self._STATES[self.is_blank]
+        self.btn = tk.Button(master, text=text, bg=bg, width=20, command=self.toggle_beam)
         self.btn.pack(padx=20, pady=10)
-        if self.is_blank == True:
-            self.btn.config(text="Unblank Beam", bg='#65A8E1')
-        else:
-            self.btn.config(text="Blank Beam", bg='#32CD32')
-
  
         # Hotkey entry
         tk.Label(master, text="Hotkey:").pack()
@@ -29,28 +28,33 @@ class BeamControllerApp:
         self.set_hotkey_btn = tk.Button(master, text="Set Hotkey", command=self.update_hotkey)
         self.set_hotkey_btn.pack(pady=10)
  
-        threading.Thread(target=self.hotkey_listener, daemon=True).start()
+        # keyboard dispatches hotkeys from its own thread; hand off to Tk's loop
+        self._on_hotkey = lambda: self.master.after(0, self.toggle_beam)
+        self._hook = keyboard.add_hotkey(self.current_hotkey, self._on_hotkey)
  
     def toggle_beam(self):
-        if self.is_blank:
-            self.tem.Def3().SetBeamBlank(1)
-            self.btn.config(text="Unblank Beam", bg='#65A8E1')
-            self.is_blank = False
-        else:
-            self.tem.Def3().SetBeamBlank(0)
-            self.btn.config(text="Blank Beam", bg='#32CD32')
-            self.is_blank = True
- 
-    def hotkey_listener(self):
-        keyboard.add_hotkey(self.current_hotkey, lambda: self.master.after(0, self.toggle_beam))
-        keyboard.wait()
+        new_state = not self.is_blank
+        value, text, bg = self._STATES[new_state]
+        self.def3.SetBeamBlank(value)
+        self.btn.config(text=text, bg=bg)
+        # Only record the new state once the microscope has accepted it
+        self.is_blank = new_state
  
     def update_hotkey(self):
         new_hotkey = self.hotkey_entry.get().strip()
-        if new_hotkey:
-            keyboard.clear_all_hotkeys()
+        if new_hotkey and new_hotkey != self.current_hotkey:
+            # keyboard also keys hotkeys by callback, so the old one must go first
+            keyboard.remove_hotkey(self._hook)
+            try:
+                self._hook = keyboard.add_hotkey(new_hotkey, self._on_hotkey)
+            except ValueError as e:
+                # Invalid name; restore the previous binding
+                print(f"Invalid hotkey '{new_hotkey}': {e}")
+                self._hook = keyboard.add_hotkey(self.current_hotkey, self._on_hotkey)
+                self.hotkey_entry.delete(0, tk.END)
+                self.hotkey_entry.insert(0, self.current_hotkey)
+                return
             self.current_hotkey = new_hotkey
-            keyboard.add_hotkey(self.current_hotkey, lambda: self.master.after(0, self.toggle_beam))
  
 def main():
     root = tk.Tk()
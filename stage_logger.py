@@ -3,38 +3,154 @@
 TEM Stage Position Logger using PyJEM API
 
 This script continuously logs TEM stage position data to a CSV file
-until manually stopped (Ctrl+C).
+until manually stopped (Ctrl+C). If the output file ends in .bin, compact
+binary records are written instead (convert with tools/bin2csv.py).
+
+On Linux, disk space is reserved a few MiB at a time ahead of the last row,
+so while logging the file ends in up to RESERVE_STEP bytes of zero padding.
+It is trimmed on a clean exit; if the logger is killed the padding stays
+until the next run on the same file, which skips and overwrites it.
 
 Requirements:
 - PyJEM library installed
 - Active connection to TEM microscope
 
 Usage:
-    python tem_stage_logger.py [output_file] [interval]
+    python tem_stage_logger.py [output_file] [interval] [--mmap]
     
 Arguments:
-    output_file: CSV file to save data (default: C:\jeol_dnr\SynergyED_stage_pos_log.csv)
+    output_file: CSV or .bin file to save data (default: C:\jeol_dnr\SynergyED_stage_pos_log.csv)
     interval: Logging interval in seconds (default: 0.1)
+    --mmap: Write through a memory-mapped window instead of file writes (Linux only)
 """
 
+import os
 import sys
+import inspect
 import time
-import csv
+import mmap
 import signal
-from datetime import datetime
+import struct
+import threading
+from collections import deque
+from string import Template
+from functools import lru_cache
 from pathlib import Path
 
 from PyJEM import TEM3
 
 
+RING_CAPACITY = 1024  # samples held between sampler and writer thread
+BATCH_SIZE = 64       # records per file write
+SYNC_EVERY = 100      # samples between flush + os.fsync
+FILE_BUFFER = 1 << 20 # bytes buffered by the file object
+WRITER_POLL = 0.05    # seconds the writer idles when there is nothing to write
+RESERVE_STEP = 4 << 20  # bytes of disk space preallocated ahead of the last row
+MMAP_WINDOW = RESERVE_STEP  # bytes mapped at a time in --mmap mode
+MMAP_FLUSH = 1 << 20    # dirty bytes between msync calls in --mmap mode
+HIGH_RATE_INTERVAL = 0.02  # intervals at or below this get a pinned, boosted sampler
+TEM_CLOSE_TIMEOUT = 5.0    # seconds to wait for the TEM connection to close on exit
+
+# Binary log format: 16-byte header, then one record per sample of
+# epoch time (float64) followed by x, y, z, alpha, beta (float32)
+RECORD = struct.Struct('<d5f')
+BIN_HEADER = struct.pack('<8sII', b'STAGELOG', 1, RECORD.size)
+
+# Sampling loop, specialized per run by StagePositionLogger.compile_sampler_loop.
+# The interval is baked in as a constant and every handle the loop touches is
+# bound as a default argument, so the hot path uses locals, not attribute lookups.
+SAMPLER_LOOP_SRC = Template('''
+def sampler_loop(running, stats, getpos=getpos, append=append, queued=queued,
+                 clock=clock, perf=perf, sleep=sleep, print=print):
+    log_count, error_count, dropped_count = stats
+    last_print_time = perf()
+    last_error_time = 0.0
+    next_time = last_print_time
+    try:
+        while running[0]:
+            try:
+                # Get stage position and queue it for the writer
+                p = getpos()
+                if queued() == $capacity:
+                    # Writer has fallen behind; the oldest queued sample is overwritten
+                    dropped_count += 1
+                append((clock(), p[0], p[1], p[2], p[3], p[4]))
+                log_count += 1
+                
+                # Print status every 10 logs, with the rate over those 10
+                if log_count % 10 == 0:
+                    now = perf()
+                    elapsed = now - last_print_time
+                    last_print_time = now
+                    rate = 10 / elapsed if elapsed > 0 else 0
+                    print(f"Logged {log_count} entries "
+                          f"(Rate: {rate:.1f} entries/sec)")
+            except Exception as e:
+                error_count += 1
+                # At most one message per second so errors don't flood the console
+                now = perf()
+                if now - last_error_time >= 1.0:
+                    last_error_time = now
+                    print(f"Error reading stage position: {e} "
+                          f"({error_count} errors so far)")
+            
+            # Sleep until the next deadline so work time does not add drift
+            next_time += $interval
+            delay = next_time - perf()
+            if delay > 0:
+                sleep(delay)
+            else:
+                # Fell behind; restart the schedule rather than bursting to catch up
+                next_time = perf()
+    finally:
+        stats[:] = [log_count, error_count, dropped_count]
+''')
+
+
+@lru_cache(maxsize=4)
+def _format_seconds(secs):
+    """Format whole epoch seconds as local ISO time (cached, so once per second)"""
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(secs)).encode('ascii')
+
+
+def _format_timestamp(t):
+    """Format an epoch time as local ISO time with microseconds, as bytes"""
+    secs = int(t)
+    return b"%s.%06d" % (_format_seconds(secs), int((t - secs) * 1_000_000))
+
+
 class StagePositionLogger:
-    def __init__(self, output_file=r"C:\jeol_dnr\SynergyED_stage_pos_log.csv", interval=0.1):
+    # Fixed schema; none of the fields ever need quoting, so no csv module
+    FIELDNAMES = ('timestamp', 'x_position', 'y_position', 'z_position',
+                  'alpha_tilt', 'beta_tilt')
+    ROW_FMT = b"%s,%.6f,%.6f,%.6f,%.6f,%.6f\n"
+    
+    def __init__(self, output_file=r"C:\jeol_dnr\SynergyED_stage_pos_log.csv", interval=0.1,
+                 use_mmap=False):
         self.output_file = Path(output_file)
+        self.binary = self.output_file.suffix.lower() == '.bin'
         self.interval = interval
-        self.running = True
+        # Mutable so the compiled sampler loop can poll it as a local
+        self.running = [True]
         self.tem = None
-        self.csv_writer = None
+        self.close_tem = None
+        self.stage3 = None
         self.csv_file = None
+        self.data_start = None
+        self.reserved_end = None
+        self.bytes_written = 0
+        self.use_mmap = use_mmap
+        self.mm = None
+        self.mm_offset = 0
+        self.write_offset = 0
+        self.flushed_offset = 0
+        self.write_data = None
+        # Single-producer/single-consumer queue; deque append/popleft are atomic
+        self.samples = deque(maxlen=RING_CAPACITY)
+        self.dropped_count = 0
+        self.error_count = 0
+        self.writer_thread = None
+        self.writer_stop = threading.Event()
         
         # Set up signal handler for graceful shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -42,79 +158,235 @@ class StagePositionLogger:
     def signal_handler(self, signum, frame):
         """Handle Ctrl+C gracefully"""
         print(f"\nReceived signal {signum}. Shutting down gracefully...")
-        self.running = False
+        self.running[0] = False
         
     def initialize_tem(self):
         """Initialize the TEM connection"""
         try:
             # Try to connect to the TEM
             self.tem = TEM3
+            self.stage3 = self.tem.Stage3()
+            
+            # Resolve how (if at all) this PyJEM build closes its connection
+            members = dict(inspect.getmembers(self.tem, callable))
+            self.close_tem = members.get('disconnect') or members.get('close')
             print("Successfully connected to TEM.")
             return True
         except Exception as e:
             print(f"Failed to connect to TEM: {e}")
             return False
     
-    def get_stage_position(self):
-        """Get current stage position from TEM"""
-        try:
-            # Get stage position data
-            stage_data = self.tem.Stage3().GetPos()
-            
-            return {
-                'timestamp': datetime.now().isoformat(),
-                'x_position': stage_data[0],
-                'y_position': stage_data[1],
-                'z_position': stage_data[2],
-                'alpha_tilt': stage_data[3],
-                'beta_tilt': stage_data[4]
-            }
-        except Exception as e:
-            print(f"Error reading stage position: {e}")
-            return None
-    
     def setup_csv_file(self):
         """Set up CSV file and writer"""
         try:
             # Create output directory if it doesn't exist
             self.output_file.parent.mkdir(parents=True, exist_ok=True)
             
-            # Open file in append mode
-            file_exists = self.output_file.exists()
-            self.csv_file = open(self.output_file, 'a', newline='')
-            
-            fieldnames = ['timestamp', 'x_position', 'y_position', 'z_position', 
-                         'alpha_tilt', 'beta_tilt']
+            # Open file in binary mode with a large buffer to batch syscalls;
+            # rows are pure ASCII so the text layer's encoding step is skipped
+            if hasattr(os, 'posix_fallocate'):
+                self.csv_file = self.open_reserved()
+                file_exists = self.data_start > 0
+            else:
+                file_exists = self.output_file.exists()
+                self.csv_file = open(self.output_file, 'ab', buffering=FILE_BUFFER)
+                if self.use_mmap:
+                    # Without preallocation a mapping cannot grow with the file
+                    print("Memory-mapped writing is not supported on this platform; "
+                          "using buffered writes")
+                    self.use_mmap = False
             
-            self.csv_writer = csv.DictWriter(self.csv_file, fieldnames=fieldnames)
+            if self.use_mmap:
+                self.write_offset = self.flushed_offset = self.data_start
+                self.write_data = self.mmap_write
+            else:
+                self.write_data = self.csv_file.write
             
             # Write header if file is new
             if not file_exists:
-                self.csv_writer.writeheader()
+                if self.binary:
+                    header = BIN_HEADER
+                else:
+                    header = ','.join(self.FIELDNAMES).encode('ascii') + b'\n'
+                self.write_data(header)
+                self.bytes_written += len(header)
                 print(f"Created new log file: {self.output_file}")
             else:
                 print(f"Appending to existing log file: {self.output_file}")
+            
+            # Disk I/O runs on its own thread so slow writes don't delay sampling
+            self.writer_thread = threading.Thread(target=self.writer_loop, daemon=True)
+            self.writer_thread.start()
                 
             return True
         except Exception as e:
             print(f"Error setting up CSV file: {e}")
             return False
     
-    def log_position(self, position_data):
-        """Log position data to CSV file"""
+    def open_reserved(self):
+        """Open the log file with disk space preallocated past the write position
+        
+        Writing into a preallocated region spares the filesystem from extending
+        the file (and updating its metadata) on every fsync. The unused tail is
+        trimmed in cleanup(); if an earlier run died before that, its zero
+        padding is skipped so new rows continue right after the real data.
+        """
+        fd = os.open(self.output_file, os.O_RDWR | os.O_CREAT, 0o644)
         try:
-            self.csv_writer.writerow(position_data)
-            self.csv_file.flush()  # Ensure data is written immediately
-            return True
+            self.data_start = self.find_data_end(fd)
+            if self.binary and self.data_start > 0:
+                # The header itself ends in zero bytes, so check it rather than
+                # trusting the stripped offset
+                if os.pread(fd, len(BIN_HEADER), 0) != BIN_HEADER:
+                    raise ValueError(f"{self.output_file} is not a version 1 stage position log")
+                # Records may legitimately end in zero bytes; round up to a whole record
+                records = -(-(self.data_start - len(BIN_HEADER)) // RECORD.size)
+                self.data_start = len(BIN_HEADER) + max(records, 0) * RECORD.size
+            
+            try:
+                os.posix_fallocate(fd, self.data_start, RESERVE_STEP)
+                self.reserved_end = self.data_start + RESERVE_STEP
+            except OSError as e:
+                print(f"Could not reserve disk space for log file: {e}")
+            os.lseek(fd, self.data_start, os.SEEK_SET)
+            return os.fdopen(fd, 'wb', buffering=FILE_BUFFER)
+        except Exception:
+            os.close(fd)
+            raise
+    
+    @staticmethod
+    def find_data_end(fd):
+        """Return the offset just past the last non-zero byte of the file"""
+        end = os.lseek(fd, 0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - FILE_BUFFER)
+            block = os.pread(fd, end - start, start).rstrip(b'\0')
+            if block:
+                return start + len(block)
+            end = start
+        return 0
+    
+    def compile_sampler_loop(self):
+        """Build the sampling loop specialized for this logger's interval and handles"""
+        source = SAMPLER_LOOP_SRC.substitute(capacity=RING_CAPACITY,
+                                             interval=repr(float(self.interval)))
+        namespace = {
+            'getpos': self.stage3.GetPos,
+            'append': self.samples.append,
+            'queued': self.samples.__len__,
+            'clock': time.time,
+            'perf': time.perf_counter,
+            'sleep': time.sleep,
+        }
+        exec(compile(source, '<sampler_loop>', 'exec'), namespace)
+        return namespace['sampler_loop']
+    
+    def writer_loop(self):
+        """Drain queued samples to the CSV file until told to stop"""
+        unsynced = 0
+        try:
+            while not self.writer_stop.is_set():
+                if not self.samples:
+                    self.writer_stop.wait(WRITER_POLL)
+                    continue
+                
+                unsynced += self.write_batch()
+                
+                # Periodically push buffered rows to disk for crash safety
+                # (mapped pages are synced by mmap_write every MMAP_FLUSH bytes)
+                if unsynced >= SYNC_EVERY:
+                    if not self.use_mmap:
+                        self.csv_file.flush()
+                        os.fsync(self.csv_file.fileno())
+                    unsynced = 0
+            
+            # Drain everything the sampler produced before shutdown
+            while self.samples:
+                self.write_batch()
         except Exception as e:
             print(f"Error writing to CSV: {e}")
-            return False
+            self.running[0] = False
+    
+    def write_batch(self):
+        """Write up to BATCH_SIZE queued samples, returning how many were written"""
+        popleft = self.samples.popleft
+        chunk = [popleft() for _ in range(min(BATCH_SIZE, len(self.samples)))]
+        if self.binary:
+            pack = RECORD.pack
+            data = b''.join([pack(*row) for row in chunk])
+        else:
+            row_fmt = self.ROW_FMT
+            data = b''.join([row_fmt % (_format_timestamp(t), x, y, z, a, b)
+                             for t, x, y, z, a, b in chunk])
+        self.write_data(data)
+        self.bytes_written += len(data)
+        if self.reserved_end is not None and not self.use_mmap:
+            self.reserve_ahead()
+        return len(chunk)
+    
+    def reserve_ahead(self):
+        """Extend the preallocated region by RESERVE_STEP once writes near its end"""
+        end = self.data_start + self.bytes_written
+        if end + RESERVE_STEP // 2 < self.reserved_end:
+            return
+        start = max(end, self.reserved_end)
+        try:
+            os.posix_fallocate(self.csv_file.fileno(), start, RESERVE_STEP)
+            self.reserved_end = start + RESERVE_STEP
+        except OSError as e:
+            # Plain appends still work, just without the preallocation benefit
+            print(f"Could not reserve more disk space for log file: {e}")
+            self.reserved_end = None
+    
+    def mmap_write(self, data):
+        """Copy data into the memory-mapped window, sliding it along the file
+        
+        The kernel writes dirty pages back lazily, so appending costs no syscall
+        until the window fills up or MMAP_FLUSH bytes are due for an msync.
+        """
+        view = memoryview(data)
+        pos = 0
+        while pos < len(view):
+            if self.mm is None or self.write_offset >= self.mm_offset + MMAP_WINDOW:
+                self.remap_window()
+            start = self.write_offset - self.mm_offset
+            count = min(len(view) - pos, MMAP_WINDOW - start)
+            self.mm[start:start + count] = view[pos:pos + count]
+            pos += count
+            self.write_offset += count
+        
+        if self.write_offset - self.flushed_offset >= MMAP_FLUSH:
+            self.flush_window()
+    
+    def remap_window(self):
+        """Map the next MMAP_WINDOW bytes of the file starting at the write offset"""
+        if self.mm is not None:
+            self.flush_window()
+            self.mm.close()
+            self.mm = None
+        
+        fd = self.csv_file.fileno()
+        self.mm_offset = self.write_offset - self.write_offset % mmap.ALLOCATIONGRANULARITY
+        # The file must cover the whole window or touching its tail faults
+        os.posix_fallocate(fd, self.mm_offset, MMAP_WINDOW)
+        self.mm = mmap.mmap(fd, MMAP_WINDOW, offset=self.mm_offset, access=mmap.ACCESS_WRITE)
+    
+    def flush_window(self):
+        """msync the pages written since the last flush"""
+        start = max(self.flushed_offset, self.mm_offset) - self.mm_offset
+        start -= start % mmap.PAGESIZE
+        end = self.write_offset - self.mm_offset
+        if end > start:
+            self.mm.flush(start, end - start)
+        self.flushed_offset = self.write_offset
     
     def run(self):
         """Main logging loop"""
         print("TEM Stage Position Logger Starting...")
         print(f"Output file: {self.output_file}")
         print(f"Logging interval: {self.interval} seconds")
+        if self.use_mmap:
+            print("Write mode: memory-mapped")
         print("Press Ctrl+C to stop logging\n")
         
         # Initialize components
@@ -126,56 +398,111 @@ class StagePositionLogger:
             print("Failed to setup CSV file. Exiting.")
             return False
         
-        # Main logging loop
-        log_count = 0
-        start_time = time.time()
-        
+        # Main logging loop; counts are written back to stats when it exits
+        stats = [0, 0, 0]
         try:
-            while self.running:
-                # Get stage position
-                position_data = self.get_stage_position()
-                
-                if position_data:
-                    # Log to file
-                    if self.log_position(position_data):
-                        log_count += 1
-                        
-                        # Print status every 10 logs
-                        if log_count % 10 == 0:
-                            elapsed = time.time() - start_time
-                            rate = log_count / elapsed if elapsed > 0 else 0
-                            print(f"Logged {log_count} entries "
-                                  f"(Rate: {rate:.1f} entries/sec)")
-                    
-                # Wait for next interval
-                time.sleep(self.interval)
-                
+            # Done after the writer thread starts so only the sampler is pinned
+            if self.interval <= HIGH_RATE_INTERVAL:
+                self.boost_sampler_thread()
+            
+            sampler_loop = self.compile_sampler_loop()
+            sampler_loop(self.running, stats)
         except Exception as e:
             print(f"Unexpected error in main loop: {e}")
         finally:
+            _, self.error_count, self.dropped_count = stats
             self.cleanup()
             
         return True
     
+    def boost_sampler_thread(self):
+        """Pin the calling thread to the last CPU and raise its priority
+        
+        At sub-20 ms intervals scheduler jitter dominates the timing error, so
+        keeping the sampler on one core at a higher priority steadies cadence.
+        Each step is attempted and reported on its own; failures only warn.
+        """
+        cpu = (os.cpu_count() or 1) - 1
+        if sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadAffinityMask.restype = ctypes.c_size_t
+            kernel32.SetThreadAffinityMask.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+            thread = kernel32.GetCurrentThread()
+            # An affinity mask only covers the first processor group
+            cpu = min(cpu, ctypes.sizeof(ctypes.c_size_t) * 8 - 1)
+        
+        try:
+            if sys.platform == 'win32':
+                if not kernel32.SetThreadAffinityMask(thread, 1 << cpu):
+                    raise ctypes.WinError()
+            else:
+                # On Linux this applies to the calling thread only
+                os.sched_setaffinity(0, {cpu})
+            print(f"High-rate logging: sampler pinned to CPU {cpu}")
+        except Exception as e:
+            print(f"Warning: could not pin sampler thread to CPU {cpu} ({e})")
+        
+        try:
+            if sys.platform == 'win32':
+                if not kernel32.SetThreadPriority(thread, 1):  # THREAD_PRIORITY_ABOVE_NORMAL
+                    raise ctypes.WinError()
+            else:
+                os.nice(-5)
+            print("High-rate logging: sampler priority raised")
+        except Exception as e:
+            print(f"Warning: could not raise sampler thread priority ({e}); "
+                  f"timing may be less regular")
+    
     def cleanup(self):
         """Clean up resources"""
         print(f"\nCleaning up...")
         
+        if self.writer_thread:
+            # Let the writer drain queued samples so none are lost
+            self.writer_stop.set()
+            self.writer_thread.join()
+            
+        if self.error_count:
+            print(f"Warning: {self.error_count} stage position reads failed")
+            
+        if self.dropped_count:
+            print(f"Warning: {self.dropped_count} samples were dropped "
+                  f"because the writer could not keep up")
+            
         if self.csv_file:
+            try:
+                if self.mm is not None:
+                    self.flush_window()
+                    self.mm.close()
+                    self.mm = None
+                self.csv_file.flush()
+                if self.data_start is not None:
+                    # Trim the preallocated space that was not used
+                    os.ftruncate(self.csv_file.fileno(), self.data_start + self.bytes_written)
+                os.fsync(self.csv_file.fileno())
+            except Exception as e:
+                print(f"Error flushing log file: {e}")
             self.csv_file.close()
             print(f"Closed log file: {self.output_file}")
             
-        if self.tem:
-            try:
-                # Close TEM connection if applicable
-                if hasattr(self.tem, 'disconnect'): #Needs checking !! (seems to work, check when in the TEM room too!)
-                    self.tem.connect()
-                elif hasattr(self.tem, 'close'):
-                    self.tem.close()
-            except Exception as e:
-                print(f"Error closing TEM connection: {e}")
+        if self.close_tem:
+            # Close TEM connection off the main thread so a hung call can't block exit
+            closer = threading.Thread(target=self.close_tem_connection, daemon=True)
+            closer.start()
+            closer.join(TEM_CLOSE_TIMEOUT)
+            if closer.is_alive():
+                print(f"TEM connection did not close within {TEM_CLOSE_TIMEOUT:.0f} s; "
+                      f"exiting anyway")
         
         print("Cleanup complete.")
+    
+    def close_tem_connection(self):
+        """Close the TEM connection, reporting rather than raising errors"""
+        try:
+            self.close_tem()
+        except Exception as e:
+            print(f"Error closing TEM connection: {e}")
 
 
 def get_user_parameters():
@@ -190,31 +517,39 @@ def get_user_parameters():
     output_file = default_output
     interval = default_interval
     
-    if len(sys.argv) > 1:
-        output_file = sys.argv[1]
-    if len(sys.argv) > 2:
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if len(args) > 0:
+        output_file = args[0]
+    if len(args) > 1:
         try:
-            interval = float(sys.argv[2])
+            interval = float(args[1])
         except ValueError:
-            print(f"Invalid interval: {sys.argv[2]}. Using default: {interval}")
+            print(f"Invalid interval: {args[1]}. Using default: {interval}")
     
+    path_changed = True
     while True:
+        output_path = Path(output_file)
+        output_dir = output_path.parent
+        
         # Display current settings
         print(f"Current Configuration:")
         print(f"  Output file: {output_file}")
-        print(f"  Output directory: {Path(output_file).parent}")
+        print(f"  Output directory: {output_dir}")
         print(f"  Logging interval: {interval} seconds ({1/interval:.1f} Hz)")
-        print(f"  File will be {'appended to' if Path(output_file).exists() else 'created'}")
+        print(f"  File will be {'appended to' if output_path.exists() else 'created'}")
         
-        # Check if directory is writable
-        try:
-            Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-            test_file = Path(output_file).parent / "test_write.tmp"
-            test_file.touch()
-            test_file.unlink()
-            print(f"  ✓ Directory is writable")
-        except Exception as e:
-            print(f"  ✗ Directory access error: {e}")
+        # Check if directory is writable (only when the path is new)
+        if path_changed:
+            try:
+                output_dir.mkdir(parents=True, exist_ok=True)
+                test_file = output_dir / "test_write.tmp"
+                test_file.touch()
+                test_file.unlink()
+                dir_status = "✓ Directory is writable"
+            except Exception as e:
+                dir_status = f"✗ Directory access error: {e}"
+            path_changed = False
+        print(f"  {dir_status}")
         
         print("\nOptions:")
         print("  1. Start logging with these settings")
@@ -230,6 +565,7 @@ def get_user_parameters():
             new_output = input(f"Enter new output file path (current: {output_file}): ").strip()
             if new_output:
                 output_file = new_output
+                path_changed = True
         elif choice == "3":
             try:
                 new_interval = float(input(f"Enter new interval in seconds (current: {interval}): ").strip())
@@ -250,7 +586,7 @@ def get_user_parameters():
     return output_file, interval
 
 
-def confirm_operation():
+def confirm_operation(use_mmap=False):
     """Final confirmation before starting logging"""
     print("\n" + "="*50)
     print("IMPORTANT INSTRUCTIONS:")
@@ -262,7 +598,15 @@ def confirm_operation():
     print("  - Close the CSV file properly")
     print("  - Disconnect from the TEM safely")
     print("• Do NOT close the terminal window or kill the process")
-    print("• The CSV file will be updated in real-time")
+    if hasattr(os, 'posix_fallocate'):
+        print(f"• While logging, the file ends in up to {RESERVE_STEP >> 20} MiB of zero")
+        print("  padding (reserved space); it is removed on Ctrl+C, or skipped by the")
+        print("  next run on the same file if the logger was killed")
+    if use_mmap and hasattr(os, 'posix_fallocate'):
+        print("• Rows are visible in the file immediately and survive the logger")
+        print(f"  crashing, but are only flushed to disk every {MMAP_FLUSH >> 20} MiB of data")
+    else:
+        print(f"• The file is written to disk every {SYNC_EVERY} samples")
     print("="*50)
     
     while True:
@@ -286,15 +630,17 @@ def main():
     if output_file is None:  # User chose to exit
         sys.exit(0)
     
+    use_mmap = '--mmap' in sys.argv[1:]
+    
     # Final confirmation
-    if not confirm_operation():
+    if not confirm_operation(use_mmap):
         print("Logging aborted by user.")
         sys.exit(0)
     
     print("\nStarting TEM Stage Position Logger...")
     
     # Create and run logger
-    logger = StagePositionLogger(output_file, interval)
+    logger = StagePositionLogger(output_file, interval, use_mmap=use_mmap)
     success = logger.run()
     
     if success:
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Convert a binary stage position log (.bin) written by stage_logger.py to CSV
+
+Usage:
+    python bin2csv.py input_file [output_file]
+
+Arguments:
+    input_file: .bin file written by stage_logger.py
+    output_file: CSV file to write (default: input_file with a .csv suffix)
+"""
+
+import sys
+import struct
+import time
+from pathlib import Path
+
+RECORD = struct.Struct('<d5f')
+HEADER = struct.Struct('<8sII')
+
+
+def convert(input_file, output_file):
+    """Convert all records in input_file, returning the number written"""
+    with open(input_file, 'rb') as src:
+        data = src.read()
+
+    magic, version, record_size = HEADER.unpack_from(data)
+    if magic != b'STAGELOG' or version != 1 or record_size != RECORD.size:
+        raise ValueError(f"{input_file} is not a version 1 stage position log")
+
+    body = data[HEADER.size:]
+    body = body[:len(body) - len(body) % RECORD.size]
+
+    count = 0
+    with open(output_file, 'w', newline='') as dst:
+        dst.write("timestamp,x_position,y_position,z_position,alpha_tilt,beta_tilt\n")
+        for t, x, y, z, a, b in RECORD.iter_unpack(body):
+            if t == 0:
+                # Zero padding left behind by an interrupted run
+                break
+            secs = int(t)
+            timestamp = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(secs))
+            dst.write(f"{timestamp}.{int((t - secs) * 1_000_000):06d},"
+                      f"{x:.6f},{y:.6f},{z:.6f},{a:.6f},{b:.6f}\n")
+            count += 1
+    return count
+
+
+def main():
+    """Main function"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    input_file = Path(sys.argv[1])
+    output_file = Path(sys.argv[2]) if len(sys.argv) > 2 else input_file.with_suffix('.csv')
+
+    try:
+        count = convert(input_file, output_file)
+    except Exception as e:
+        print(f"Conversion failed: {e}")
+        sys.exit(1)
+
+    print(f"Wrote {count} entries to {output_file}")
+
+
+if __name__ == "__main__":
+    main()